@@ -5,8 +5,10 @@ import plotly.graph_objects as go
 from datetime import datetime
 import os
 import numpy as np
+import pyarrow.parquet as pq
 from collections import Counter
 import re
+from parquet_copies import parquet_path, write_parquet_copy
 
 # Set page title and layout
 st.set_page_config(
@@ -50,6 +52,15 @@ st.markdown("""
         padding: 0.5rem;
         border-left: 2px solid #4d7eff;
     }
+    .metric-row {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 1rem;
+    }
+    .metric-row .metric-card {
+        flex: 1;
+        min-width: 10rem;
+    }
     .metric-card {
         background-color: white;
         border-radius: 5px;
@@ -116,89 +127,383 @@ if missing_files:
     st.info("Please run simple_data_generator.py first to create sample data.")
     st.stop()
 
-# Function to load data
-@st.cache_data(ttl=3600)
-def load_data():
+# Function to load a CSV as an Arrow table. The CSV is converted once to a Parquet
+# copy next to it (rebuilt when the CSV is newer), so later loads only read the
+# requested columns. The table is shared across sessions without copying; csv_mtime
+# is only part of the cache key, so a rewritten CSV is loaded again.
+@st.cache_resource(ttl=3600)
+def load_table(csv_path, csv_mtime, columns=None):
+    table_path = parquet_path(csv_path)
+    if not os.path.exists(table_path) or os.path.getmtime(table_path) < os.path.getmtime(csv_path):
+        write_parquet_copy(csv_path)
+    
+    # Only project columns the file actually has; optional ones are checked downstream
+    if columns is not None:
+        available = pq.read_schema(table_path).names
+        columns = [col for col in columns if col in available]
+    return pq.read_table(table_path, columns=columns)
+
+# Function to get the modification times of the data files, used as a cache key so the
+# data is reloaded as soon as a fetch rewrites the files
+def data_file_mtimes():
+    paths = ["repositories.csv", "commits.csv", "contributors.csv", "github_data/repositories.csv",
+             "github_data/commits.csv", "github_data/contributors.csv"]
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+
+# Function to load data. The frames are cached as shared resources and returned by
+# reference, so callers must not modify them in place; derived columns belong here.
+# data_mtimes is only part of the cache key.
+@st.cache_resource(ttl=3600)
+def load_data(data_mtimes):
+    # Columns used by the dashboard
+    repo_columns = ['org', 'repo_name', 'stars', 'forks', 'language', 'created_at', 'updated_at']
+    commit_columns = ['org', 'repo_name', 'author', 'message', 'date']
+    
     # Try to load from main directory first, then from github_data if that fails
     try:
-        repos_df = pd.read_csv("repositories.csv")
-        commits_df = pd.read_csv("commits.csv")
+        repos_df = load_table("repositories.csv", os.path.getmtime("repositories.csv"),
+                              repo_columns).to_pandas()
+        commits_df = load_table("commits.csv", os.path.getmtime("commits.csv"),
+                                commit_columns).to_pandas()
         
         # Check if contributors file exists
         if os.path.exists("contributors.csv"):
-            contributors_df = pd.read_csv("contributors.csv")
+            contributors_df = load_table("contributors.csv", os.path.getmtime("contributors.csv")).to_pandas()
         else:
             contributors_df = None
             
     except:
         # Try github_data directory as fallback
         if os.path.exists("github_data/repositories.csv") and os.path.exists("github_data/commits.csv"):
-            repos_df = pd.read_csv("github_data/repositories.csv")
-            commits_df = pd.read_csv("github_data/commits.csv")
+            repos_df = load_table("github_data/repositories.csv", os.path.getmtime("github_data/repositories.csv"),
+                                  repo_columns).to_pandas()
+            commits_df = load_table("github_data/commits.csv", os.path.getmtime("github_data/commits.csv"),
+                                    commit_columns).to_pandas()
             
             if os.path.exists("github_data/contributors.csv"):
-                contributors_df = pd.read_csv("github_data/contributors.csv")
+                contributors_df = load_table("github_data/contributors.csv",
+                                             os.path.getmtime("github_data/contributors.csv")).to_pandas()
             else:
                 contributors_df = None
         else:
             raise FileNotFoundError("Could not find data files in either main directory or github_data directory")
     
-    # Convert date strings to datetime
-    repos_df['created_at'] = pd.to_datetime(repos_df['created_at'])
-    repos_df['updated_at'] = pd.to_datetime(repos_df['updated_at'])
-    commits_df['date'] = pd.to_datetime(commits_df['date'])
+    # Store repeated string columns as categoricals so filters and group-bys work on codes.
+    # org and repo_name share the same categories in every table so their codes line up.
+    tables = [df for df in (repos_df, commits_df, contributors_df) if df is not None]
+    for col in ['org', 'repo_name']:
+        shared_dtype = pd.CategoricalDtype(sorted(set().union(*(df[col].dropna().unique() for df in tables))))
+        for df in tables:
+            df[col] = df[col].astype(shared_dtype)
+    if 'language' in repos_df.columns:
+        repos_df['language'] = repos_df['language'].astype('category')
+    commits_df['author'] = commits_df['author'].astype('category')
+    
+    # Downcast repository counts; missing or malformed values become <NA>
+    for col in ['stars', 'forks']:
+        if col in repos_df.columns:
+            repos_df[col] = pd.to_numeric(repos_df[col], errors='coerce').astype('Int32')
     
-    # Extract additional date information for analysis
-    commits_df['year'] = commits_df['date'].dt.year
-    commits_df['month'] = commits_df['date'].dt.month
+    # Extract additional date information for analysis, using the smallest integer types
+    commits_df['year'] = commits_df['date'].dt.year.astype('uint16')
+    commits_df['month'] = commits_df['date'].dt.month.astype('uint8')
     commits_df['month_name'] = commits_df['date'].dt.month_name()
+    commits_df['month_year'] = np.datetime_as_string(commits_df['date'].values, unit='M')
+    # Day of week (0 = Monday) and hour as small integers; day names are looked up in
+    # DAY_NAMES only when plotting
+    commits_df['dow'] = commits_df['date'].dt.dayofweek.astype('int8')
+    commits_df['hour'] = commits_df['date'].dt.hour.astype('int8')
+    # Week bucket labelled by the Sunday ending the week, like pd.Grouper(freq='W')
+    commits_df['week'] = commits_df['date'].dt.normalize() + pd.to_timedelta(6 - commits_df['dow'], unit='D')
     
-    # Ensure day_of_week and hour_of_day exist
-    if 'day_of_week' not in commits_df.columns:
-        commits_df['day_of_week'] = commits_df['date'].dt.day_name()
-    if 'hour_of_day' not in commits_df.columns:
-        commits_df['hour_of_day'] = commits_df['date'].dt.hour
+    # Analyze commit messages if applicable
+    if 'message' in commits_df.columns:
+        commits_df = analyze_commit_messages(commits_df)
     
     return repos_df, commits_df, contributors_df
 
+# Day names indexed by the dow column
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Common patterns to look for in commit messages (matched case-insensitively)
+COMMIT_PATTERNS = {
+    'feature': r'add|new|feature|implement|support',
+    'bug_fix': r'fix|bug|issue|problem|error|crash',
+    'refactor': r'refactor|clean|improve|enhance|optimize|update',
+    'docs': r'doc|comment|readme|changelog',
+    'test': r'test|spec|unittest',
+    'style': r'style|format|whitespace|indent',
+    'merge': r'merge|pull request|PR'
+}
+
+# The patterns compiled once at import. Each pattern is searched separately, so
+# overlapping keywords (e.g. "PR" inside "problem") set every flag they match.
+COMMIT_PATTERN_REGEXES = {name: re.compile(regex, re.IGNORECASE) for name, regex in COMMIT_PATTERNS.items()}
+
 # Function to extract patterns from commit messages
-@st.cache_data
 def analyze_commit_messages(commits_df):
     # Don't analyze if no message column
     if 'message' not in commits_df.columns:
         return commits_df
         
-    # Common patterns to look for in commit messages
-    patterns = {
-        'feature': r'(?i)add|new|feature|implement|support',
-        'bug_fix': r'(?i)fix|bug|issue|problem|error|crash',
-        'refactor': r'(?i)refactor|clean|improve|enhance|optimize|update',
-        'docs': r'(?i)doc|comment|readme|changelog',
-        'test': r'(?i)test|spec|unittest',
-        'style': r'(?i)style|format|whitespace|indent',
-        'merge': r'(?i)merge|pull request|PR'
-    }
+    # Store the messages as a categorical so repeated messages (merges, automated
+    # commits) are kept once, then search the patterns in each distinct message only
+    # once and broadcast the flags to the commits through the category codes
+    messages = commits_df['message'].astype('category')
+    distinct_messages = messages.cat.categories.to_series().astype(str)
+    category_matches = pd.concat([distinct_messages.str.contains(regex).rename(name)
+                                  for name, regex in COMMIT_PATTERN_REGEXES.items()], axis=1)
     
-    # Initialize columns for each pattern
-    for pattern_name in patterns:
-        commits_df[pattern_name] = False
-    
-    # Detect patterns in commit messages
-    for idx, row in commits_df.iterrows():
-        message = str(row['message'])
-        for pattern_name, regex in patterns.items():
-            if re.search(regex, message):
-                commits_df.at[idx, pattern_name] = True
+    # Missing messages have code -1, which selects the all-False row appended last
+    flags = np.vstack([category_matches.to_numpy(),
+                       np.zeros((1, len(category_matches.columns)), dtype=bool)])
+    pattern_flags = pd.DataFrame(flags[messages.cat.codes.to_numpy()],
+                                 index=commits_df.index, columns=category_matches.columns)
     
+    commits_df = pd.concat([commits_df.drop(columns=['message']), messages, pattern_flags], axis=1)
+
     return commits_df
 
+# Function to drop categories that no longer occur in a filtered frame
+def drop_unused_categories(df):
+    category_cols = df.select_dtypes('category').columns
+    return df.assign(**{col: df[col].cat.remove_unused_categories() for col in category_cols})
+
+# Function to index a frame by organization and repository so selections become sorted slices.
+# The frame is not hashed (leading underscore); the table name and data_mtimes identify it.
+@st.cache_resource(ttl=3600)
+def index_by_repo(_df, table, data_mtimes):
+    return _df.set_index(['org', 'repo_name']).sort_index()
+
+# Function to select the rows of some repositories of an organization from an indexed frame
+def select_repos(indexed_df, org, repos):
+    # .loc raises on missing labels, so only ask for repositories present in the index
+    present_repos = [repo for repo in repos if (org, repo) in indexed_df.index]
+    # An org can have repositories without any rows here, e.g. when fetching its commits
+    # or contributors failed; .loc raises on an org missing from the index
+    if not present_repos:
+        return indexed_df.iloc[0:0].reset_index()
+    return indexed_df.loc[(org, present_repos), :].reset_index()
+
+# Function to coarsen a per-group time series so no trace sends more than max_points
+# points to the browser. Values are combined into daily, weekly or monthly buckets
+# depending on the date span; use agg='last' for cumulative values.
+def downsample(df, date_col, value_col, group_col, max_points=2000, agg='sum'):
+    if df.empty or df.groupby(group_col, observed=True).size().max() <= max_points:
+        return df
+    
+    span_days = (df[date_col].max() - df[date_col].min()).days + 1
+    if span_days <= max_points:
+        freq = 'D'
+    elif span_days <= max_points * 7:
+        freq = 'W'
+    else:
+        freq = 'MS'
+    
+    return (df.groupby([pd.Grouper(key=date_col, freq=freq), group_col], observed=True)[value_col]
+            .agg(agg).reset_index())
+
+# Function to keep at most max_points evenly spaced rows of a smooth curve, always
+# including the first and last row
+def thin_rows(df, max_points=2000):
+    if len(df) <= max_points:
+        return df
+    return df.iloc[np.linspace(0, len(df) - 1, max_points).round().astype(int)]
+
+# Function to aggregate commit activity over time for the Commit Activity tab.
+# The filtered commits are not hashed (leading underscore); filter_key identifies them.
+@st.cache_data(ttl=3600, max_entries=32)
+def aggregate_commit_activity(_commits, filter_key):
+    # Daily commits per repository, grouping on dates floored to midnight
+    commit_days = _commits['date'].dt.normalize()
+    commit_counts = _commits.groupby([commit_days, 'repo_name'], observed=True).size().reset_index(name='count')
+    daily_chart = downsample(commit_counts, 'date', 'count', 'repo_name')
+    
+    # Overall daily commits, with a 7-day moving average if we have enough data
+    overall_commits = commit_counts.groupby('date')['count'].sum().to_frame()
+    if len(overall_commits) >= 7:
+        overall_commits['rolling_avg'] = overall_commits['count'].rolling(window=7).mean()
+    # The average is computed on the full daily series; only the plotted rows are thinned
+    overall_commits = thin_rows(overall_commits)
+    
+    # Monthly commits per repository
+    monthly_commits = _commits.groupby(['month_year', 'repo_name'], observed=True).size().reset_index(name='count')
+    monthly_commits.columns = ['month', 'repo_name', 'count']
+    
+    # Count commits per date and repo, then accumulate the counts within each repo
+    commits_per_date = _commits.groupby(['date', 'repo_name'], observed=True).size()
+    cumulative_commits = (commits_per_date.groupby(level='repo_name', observed=True).cumsum()
+                          .reset_index(name='cumulative_commits'))
+    cumulative_chart = downsample(cumulative_commits, 'date', 'cumulative_commits', 'repo_name', agg='last')
+    
+    return daily_chart, overall_commits, monthly_commits, cumulative_chart
+
+# Function to aggregate commit counts and commit density per repository
+@st.cache_data(ttl=3600, max_entries=32)
+def aggregate_repo_activity(_commits, filter_key):
+    repo_activity = _commits.groupby('repo_name', observed=True).size().reset_index(name='commit_count')
+    repo_activity = repo_activity.sort_values('commit_count', ascending=False)
+    
+    # Calculate days of activity for each repo in a single group-by pass
+    repo_dates = _commits.groupby('repo_name', observed=True)['date'].agg(['min', 'max'])
+    # Add 1 to include both start and end dates
+    repo_days = (repo_dates['max'].dt.normalize() - repo_dates['min'].dt.normalize()).dt.days + 1
+    
+    # Calculate commit density
+    repo_activity['active_days'] = repo_activity['repo_name'].map(repo_days).astype(int)
+    repo_activity['commits_per_day'] = repo_activity['commit_count'] / repo_activity['active_days']
+    
+    return repo_activity
+
+# Function to aggregate contributor rankings and activity for the Contributor Insights tab
+@st.cache_data(ttl=3600, max_entries=32)
+def aggregate_contributor_activity(_commits, filter_key):
+    # Count commits per author once; value_counts sorts by count, descending
+    author_counts = _commits['author'].value_counts()
+    
+    # Get top contributors based on commit count
+    top_contributors = author_counts.head(20).rename_axis('author').reset_index(name='commits')
+    
+    # Calculate cumulative percentage of commits; the last cumulative count is the total
+    # (there are no counts when every author is missing)
+    all_contributors = author_counts.rename_axis('author').reset_index(name='commits')
+    all_contributors['cum_commits'] = all_contributors['commits'].cumsum()
+    total_commits = all_contributors['cum_commits'].iat[-1] if len(all_contributors) else 0
+    all_contributors['percent_total'] = 100 * all_contributors['cum_commits'] / total_commits
+    all_contributors['contributor_rank'] = range(1, len(all_contributors) + 1)
+    all_contributors['contributor_percentile'] = 100 * all_contributors['contributor_rank'] / len(all_contributors)
+    
+    # Weekly commits of the top 5 contributors
+    top5_contributors = top_contributors.head(5)['author'].tolist()
+    top5_activity = _commits[_commits['author'].isin(top5_contributors)]
+    activity_ts = top5_activity.groupby(['week', 'author'], observed=True).size().reset_index(name='commits')
+    activity_ts = activity_ts.rename(columns={'week': 'date'})
+    activity_ts = downsample(drop_unused_categories(activity_ts), 'date', 'commits', 'author')
+    
+    # Count unique contributors per repository; groups are left unsorted since the
+    # result is sorted by count anyway
+    contributors_per_repo = (_commits.groupby('repo_name', observed=True, sort=False)['author'].nunique()
+                             .sort_values(ascending=False).reset_index(name='contributor_count'))
+    
+    return top_contributors, all_contributors, activity_ts, contributors_per_repo
+
+# Functions to build the Pareto and weekly top-5 contributor figures. The figures are
+# cached as shared resources per filter selection so reruns skip rebuilding them with
+# Plotly Express; st.plotly_chart serializes a copy and leaves the cached figure untouched.
+@st.cache_resource(ttl=3600, max_entries=32)
+def build_pareto_figure(_all_contributors, filter_key):
+    # Create Pareto chart
+    # Plot a thinned copy of the curve; the annotation below still reads the full table
+    fig = px.line(thin_rows(_all_contributors), x='contributor_percentile', y='percent_total',
+                 title="Contribution Distribution (Pareto Analysis)",
+                 labels={'contributor_percentile': 'Percentage of Contributors', 
+                         'percent_total': 'Percentage of Total Commits'})
+    
+    # Add reference line for equal distribution; a straight line only needs its end points
+    fig.add_trace(go.Scatter(x=[0, 100], y=[0, 100], mode='lines', name='Equal Distribution',
+                            line=dict(color='red', dash='dash')))
+    
+    # Add annotation for 80/20 rule if applicable
+    if len(_all_contributors) > 5:
+        # Find point closest to 20% of contributors by binary search, since the
+        # percentiles increase with rank; the closest may be the point just below 20%
+        percentiles = _all_contributors['contributor_percentile'].to_numpy()
+        idx_20pct = min(np.searchsorted(percentiles, 20), len(percentiles) - 1)
+        if idx_20pct > 0 and 20 - percentiles[idx_20pct - 1] <= percentiles[idx_20pct] - 20:
+            idx_20pct -= 1
+        pct_at_20 = _all_contributors['percent_total'].iat[idx_20pct]
+        
+        fig.add_annotation(
+            x=20, y=pct_at_20,
+            text=f"Top 20% of contributors<br>make {pct_at_20:.0f}% of commits",
+            showarrow=True,
+            arrowhead=1
+        )
+    
+    fig.update_layout(
+        xaxis_title="Percentage of Contributors",
+        yaxis_title="Percentage of Total Commits",
+        height=400
+    )
+    
+    return fig
+
+@st.cache_resource(ttl=3600, max_entries=32)
+def build_weekly_contributors_figure(_activity_ts, filter_key, selected_org):
+    fig = px.line(_activity_ts, x='date', y='commits', color='author',
+                title=f"Weekly Commit Activity of Top 5 Contributors - {selected_org}",
+                labels={"date": "Date", "commits": "Number of Commits", "author": "Contributor"})
+    
+    fig.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Number of Commits",
+        height=400
+    )
+    
+    return fig
+
+# Function to aggregate commits by day of week and hour of day for the Time Patterns tab
+@st.cache_data(ttl=3600, max_entries=32)
+def aggregate_time_patterns(_commits, filter_key):
+    day_counts = _commits['dow'].value_counts().reindex(range(7)).reset_index()
+    day_counts.columns = ['day', 'commits']
+    day_counts['day'] = DAY_NAMES
+    
+    # Calculate percentage of weekday vs weekend (Monday to Friday are dow 0-4)
+    weekday_mask = _commits['dow'].to_numpy() < 5
+    weekday_commits = weekday_mask.sum()
+    weekend_commits = (~weekday_mask).sum()
+    weekday_pct = 100 * weekday_commits / (weekday_commits + weekend_commits)
+    
+    hour_counts = _commits['hour'].value_counts().sort_index().reset_index()
+    hour_counts.columns = ['hour', 'commits']
+    
+    # Calculate business hours vs non-business hours (simplified)
+    # Assume 9am-5pm is business hours in some standard time zone
+    hours = _commits['hour'].to_numpy()
+    business_mask = (hours >= 9) & (hours <= 17)
+    business_commits = business_mask.sum()
+    nonbusiness_commits = (~business_mask).sum()
+    business_pct = 100 * business_commits / (business_commits + nonbusiness_commits)
+    
+    # Count commits per day x hour cell for the heatmap with one bincount over the flattened
+    # cell index; rows are days starting with Monday, columns are hours 0-23
+    cell_index = _commits['dow'].to_numpy(dtype=np.int32) * 24 + hours
+    heatmap_counts = np.bincount(cell_index, minlength=7 * 24).reshape(7, 24)
+    
+    return day_counts, weekday_pct, hour_counts, business_pct, heatmap_counts
+
+# Function to get the top value of sorted value counts and its count, or "N/A" when
+# there are no counts (e.g. every value is missing)
+def top_count(counts):
+    if counts.empty:
+        return 'N/A', 0
+    return counts.index[0], counts.iat[0]
+
+# Function to find the most active repository, contributor, day of week and hour, each
+# returned with its commit count
+@st.cache_data(ttl=3600, max_entries=32)
+def aggregate_insights(_commits, filter_key):
+    # Count each column once; value_counts sorts descending, so the top value and its count come first
+    repo_counts, author_counts, day_counts, hour_counts = \
+        [_commits[col].value_counts() for col in ['repo_name', 'author', 'dow', 'hour']]
+    
+    day, day_commits = top_count(day_counts)
+    return (top_count(repo_counts),
+            top_count(author_counts),
+            (DAY_NAMES[day] if day_commits else day, day_commits),
+            top_count(hour_counts))
+
 # Try to load the data
 try:
-    repos_df, commits_df, contributors_df = load_data()
+    data_mtimes = data_file_mtimes()
+    repos_df, commits_df, contributors_df = load_data(data_mtimes)
     
-    # Analyze commit messages if applicable
-    if 'message' in commits_df.columns:
-        commits_df = analyze_commit_messages(commits_df)
+    # Index the tables by repository for the selection filters
+    indexed_repos = index_by_repo(repos_df, 'repositories', data_mtimes)
+    indexed_commits = index_by_repo(commits_df, 'commits', data_mtimes)
+    indexed_contributors = (index_by_repo(contributors_df, 'contributors', data_mtimes)
+                            if contributors_df is not None else None)
         
 except Exception as e:
     st.error(f"Error loading data: {e}")
@@ -216,7 +521,9 @@ contributor engagement, repository statistics, and development trends to gain de
 st.sidebar.title("Analytics Controls")
 
 # Organization filter
-orgs = sorted(repos_df['org'].unique())
+# The categories are already sorted; org categories are shared with the other tables,
+# so drop the ones without repositories first
+orgs = repos_df['org'].cat.remove_unused_categories().cat.categories.tolist()
 selected_org = st.sidebar.selectbox(
     "Organization", 
     orgs,
@@ -237,17 +544,12 @@ time_filter = st.sidebar.date_input(
 
 if len(time_filter) == 2:
     start_date, end_date = time_filter
-    date_filtered_commits = commits_df[
-        (commits_df['date'].dt.date >= start_date) & 
-        (commits_df['date'].dt.date <= end_date)
-    ]
 else:
     start_date, end_date = min_date, max_date
-    date_filtered_commits = commits_df
 
 # Filter repos by selected organization
 org_repos_df = repos_df[repos_df['org'] == selected_org]
-repo_names = sorted(org_repos_df['repo_name'].unique())
+repo_names = org_repos_df['repo_name'].cat.remove_unused_categories().cat.categories.tolist()
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### Repository Selection")
@@ -278,10 +580,10 @@ st.sidebar.markdown("### Advanced Filters")
 # Language filter - only show if we have language data
 if 'language' in repos_df.columns:
     # Get list of languages used in the selected organization
-    org_languages = repos_df[repos_df['org'] == selected_org]['language'].dropna().unique()
+    org_languages = org_repos_df['language'].cat.remove_unused_categories().cat.categories.tolist()
     
     if len(org_languages) > 0:
-        languages = ['All'] + sorted(org_languages.tolist())
+        languages = ['All'] + org_languages
         selected_language = st.sidebar.selectbox("Programming Language", languages)
     else:
         selected_language = 'All'
@@ -299,11 +601,15 @@ else:
     selected_commit_type = 'All'
 
 # Filter data based on selections
-filtered_repos = repos_df[(repos_df['org'] == selected_org) & (repos_df['repo_name'].isin(selected_repos))]
-filtered_commits = date_filtered_commits[
-    (date_filtered_commits['org'] == selected_org) & 
-    (date_filtered_commits['repo_name'].isin(selected_repos))
-]
+filtered_repos = select_repos(indexed_repos, selected_org, selected_repos)
+filtered_commits = select_repos(indexed_commits, selected_org, selected_repos)
+
+# Compare raw datetime64 values against [start, end + 1 day) instead of building
+# Python date objects for every commit
+commit_dates = filtered_commits['date'].values
+range_start = np.datetime64(start_date)
+range_end = np.datetime64(end_date) + np.timedelta64(1, 'D')
+filtered_commits = filtered_commits[(commit_dates >= range_start) & (commit_dates < range_end)]
 
 # Apply language filter if not 'All' and we have language data
 if selected_language != 'All' and 'language' in repos_df.columns:
@@ -329,12 +635,18 @@ if selected_commit_type != 'All' and has_patterns:
     if selected_commit_type in filter_map:
         filtered_commits = filtered_commits[filtered_commits[filter_map[selected_commit_type]] == True]
 
+# Drop categories left empty by the filters so counts and charts only cover the selection
+filtered_repos = drop_unused_categories(filtered_repos)
+filtered_commits = drop_unused_categories(filtered_commits)
+
+# Key identifying the current filter selection and data files, used to cache per-selection
+# aggregates; a fetch that rewrites the files changes data_mtimes and invalidates them
+filter_key = (data_mtimes, selected_org, tuple(selected_repos), start_date, end_date, selected_language,
+              selected_commit_type)
+
 # Filter contributors data if available
 if contributors_df is not None:
-    filtered_contributors = contributors_df[
-        (contributors_df['org'] == selected_org) & 
-        (contributors_df['repo_name'].isin(selected_repos))
-    ]
+    filtered_contributors = select_repos(indexed_contributors, selected_org, selected_repos)
     
     # Apply language filter to contributors if applicable
     if selected_language != 'All' and 'language' in repos_df.columns and len(language_repos) > 0:
@@ -351,45 +663,29 @@ They help you quickly assess the scale and intensity of development efforts.
 </div>
 """, unsafe_allow_html=True)
 
-col1, col2, col3, col4, col5 = st.columns(5)
-
-with col1:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    st.markdown(f'<div class="metric-value">{len(selected_repos)}</div>', unsafe_allow_html=True)
-    st.markdown('<div class="metric-label">Repositories</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-with col2:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    total_commits = len(filtered_commits)
-    st.markdown(f'<div class="metric-value">{total_commits:,}</div>', unsafe_allow_html=True)
-    st.markdown('<div class="metric-label">Total Commits</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-with col3:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    total_contributors = len(filtered_commits['author'].unique())
-    st.markdown(f'<div class="metric-value">{total_contributors:,}</div>', unsafe_allow_html=True)
-    st.markdown('<div class="metric-label">Unique Contributors</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+total_commits = len(filtered_commits)
+total_contributors = filtered_commits['author'].nunique()
+days_diff = max(1, (end_date - start_date).days)
+avg_commits_per_day = round(total_commits / days_diff, 1)
+if filtered_repos.empty or 'stars' not in filtered_repos.columns:
+    total_stars = 0
+else:
+    total_stars = filtered_repos['stars'].sum()
 
-with col4:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    days_diff = max(1, (end_date - start_date).days)
-    avg_commits_per_day = round(total_commits / days_diff, 1)
-    st.markdown(f'<div class="metric-value">{avg_commits_per_day}</div>', unsafe_allow_html=True)
-    st.markdown('<div class="metric-label">Commits/Day</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+metric_cards = [
+    (f"{len(selected_repos)}", "Repositories"),
+    (f"{total_commits:,}", "Total Commits"),
+    (f"{total_contributors:,}", "Unique Contributors"),
+    (f"{avg_commits_per_day}", "Commits/Day"),
+    (f"{total_stars:,}", "Total Stars")
+]
 
-with col5:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    if filtered_repos.empty or 'stars' not in filtered_repos.columns:
-        total_stars = 0
-    else:
-        total_stars = filtered_repos['stars'].sum()
-    st.markdown(f'<div class="metric-value">{total_stars:,}</div>', unsafe_allow_html=True)
-    st.markdown('<div class="metric-label">Total Stars</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+# Render all metric cards with a single markdown element
+metrics_html = ''.join(
+    f'<div class="metric-card"><div class="metric-value">{value}</div><div class="metric-label">{label}</div></div>'
+    for value, label in metric_cards
+)
+st.markdown(f'<div class="metric-row">{metrics_html}</div>', unsafe_allow_html=True)
 
 # Create tabs for different visualizations
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -415,8 +711,8 @@ with tab1:
     
     # Line chart of commits over time
     if not filtered_commits.empty:
-        # Group commits by date
-        commit_counts = filtered_commits.groupby([pd.Grouper(key='date', freq='D'), 'repo_name']).size().reset_index(name='count')
+        # Aggregate commits by day, month and cumulatively (cached per filter selection)
+        daily_chart, overall_commits, monthly_commits, cumulative_chart = aggregate_commit_activity(filtered_commits, filter_key)
         
         st.markdown('<div class="chart-header">Daily Commit Activity</div>', unsafe_allow_html=True)
         st.markdown("""
@@ -428,9 +724,10 @@ with tab1:
         """, unsafe_allow_html=True)
         
         # Create time series chart
-        fig = px.line(commit_counts, x='date', y='count', color='repo_name',
+        fig = px.line(daily_chart, x='date', y='count', color='repo_name',
                      title=f"Daily Commit Activity - {selected_org}",
-                     labels={"date": "Date", "count": "Number of Commits", "repo_name": "Repository"})
+                     labels={"date": "Date", "count": "Number of Commits", "repo_name": "Repository"},
+                     render_mode='webgl')
         
         fig.update_layout(
             xaxis_title="Date",
@@ -452,19 +749,14 @@ with tab1:
         </div>
         """, unsafe_allow_html=True)
         
-        # Calculate overall commit trend
-        overall_commits = commit_counts.groupby('date')['count'].sum().reset_index()
-        overall_commits.set_index('date', inplace=True)
-        
-        # Only calculate rolling average if we have enough data
-        if len(overall_commits) >= 7:
-            overall_commits['rolling_avg'] = overall_commits['count'].rolling(window=7).mean()
-            
+        # Only plot the rolling average if we have enough data
+        if 'rolling_avg' in overall_commits.columns:
             # Plot the moving average
             fig2 = px.line(overall_commits.reset_index(), x='date', y=['count', 'rolling_avg'],
                           title="7-Day Moving Average of Commits",
                           labels={"date": "Date", "value": "Number of Commits", "variable": "Metric"},
-                          color_discrete_map={"count": "lightgrey", "rolling_avg": "blue"})
+                          color_discrete_map={"count": "lightgrey", "rolling_avg": "blue"},
+                          render_mode='webgl')
             
             fig2.update_layout(
                 xaxis_title="Date",
@@ -499,13 +791,6 @@ with tab1:
         </div>
         """, unsafe_allow_html=True)
         
-        # Add month_year column for better grouping
-        filtered_commits['month_year'] = filtered_commits['date'].dt.strftime('%Y-%m')
-        
-        # Group by month
-        monthly_commits = filtered_commits.groupby(['month_year', 'repo_name']).size().reset_index(name='count')
-        monthly_commits.columns = ['month', 'repo_name', 'count']
-        
         fig3 = px.bar(monthly_commits, x='month', y='count', color='repo_name',
                     title=f"Monthly Commit Activity - {selected_org}",
                     labels={"month": "Month", "count": "Number of Commits", "repo_name": "Repository"},
@@ -531,16 +816,10 @@ with tab1:
         </div>
         """, unsafe_allow_html=True)
         
-        # Create dataframe with cumulative commits
-        cumulative_df = filtered_commits.sort_values('date')
-        cumulative_df['cumulative_commits'] = cumulative_df.groupby('repo_name').cumcount() + 1
-        
-        # Group by date and repo for the chart
-        cumulative_chart = cumulative_df.groupby(['date', 'repo_name'])['cumulative_commits'].max().reset_index()
-        
         fig4 = px.line(cumulative_chart, x='date', y='cumulative_commits', color='repo_name',
                       title=f"Cumulative Commits Over Time - {selected_org}",
-                      labels={"date": "Date", "cumulative_commits": "Total Commits", "repo_name": "Repository"})
+                      labels={"date": "Date", "cumulative_commits": "Total Commits", "repo_name": "Repository"},
+                      render_mode='webgl')
         
         fig4.update_layout(
             xaxis_title="Date",
@@ -638,9 +917,8 @@ with tab2:
     """, unsafe_allow_html=True)
     
     if not filtered_commits.empty:
-        # Count commits per repository
-        repo_activity = filtered_commits.groupby('repo_name').size().reset_index(name='commit_count')
-        repo_activity = repo_activity.sort_values('commit_count', ascending=False)
+        # Count commits and commit density per repository (cached per filter selection)
+        repo_activity = aggregate_repo_activity(filtered_commits, filter_key)
         
         fig = px.bar(repo_activity, x='repo_name', y='commit_count',
                    title=f"Repositories by Commit Activity - {selected_org}",
@@ -667,19 +945,6 @@ with tab2:
         </div>
         """, unsafe_allow_html=True)
         
-        # Calculate days of activity for each repo
-        repo_days = {}
-        for repo in repo_activity['repo_name']:
-            repo_commits = filtered_commits[filtered_commits['repo_name'] == repo]
-            if not repo_commits.empty:
-                min_date = repo_commits['date'].min().date()
-                max_date = repo_commits['date'].max().date()
-                days = max(1, (max_date - min_date).days + 1)  # Add 1 to include both start and end dates
-                repo_days[repo] = days
-        
-        # Calculate commit density
-        repo_activity['active_days'] = repo_activity['repo_name'].map(repo_days)
-        repo_activity['commits_per_day'] = repo_activity['commit_count'] / repo_activity['active_days']
         repo_activity = repo_activity.sort_values('commits_per_day', ascending=False)
         
         fig = px.bar(repo_activity, x='repo_name', y='commits_per_day',
@@ -716,7 +981,8 @@ with tab2:
         # Create a scatter plot for the timeline
         fig = px.scatter(timeline_data, x='created_at', y='repo_name',
                       title=f"Repository Creation Timeline - {selected_org}",
-                      color='repo_name', size=[20] * len(timeline_data))
+                      color='repo_name', size=[20] * len(timeline_data),
+                      render_mode='webgl')
         
         fig.update_traces(marker=dict(symbol='diamond', opacity=0.8))
         fig.update_layout(
@@ -731,7 +997,7 @@ with tab2:
         st.info("No repository creation data available.")
     
     # Programming languages
-    if 'language' in filtered_repos.columns and not filtered_repos['language'].isna().all():
+    if 'language' in filtered_repos.columns and filtered_repos['language'].count() > 0:
         st.markdown('<div class="chart-header">Technology Stack (Programming Languages)</div>', unsafe_allow_html=True)
         st.markdown("""
         <div class="chart-description">
@@ -743,8 +1009,8 @@ with tab2:
         """, unsafe_allow_html=True)
         
         # Count languages and replace NaN with "Unknown"
-        filtered_repos['language'] = filtered_repos['language'].fillna("Unknown")
-        language_counts = filtered_repos['language'].value_counts().reset_index()
+        languages = filtered_repos['language'].astype(object).fillna("Unknown")
+        language_counts = languages.value_counts().reset_index()
         language_counts.columns = ['language', 'count']
         
         if not language_counts.empty:
@@ -782,9 +1048,8 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
         
-        top_contributors = filtered_commits['author'].value_counts().reset_index()
-        top_contributors.columns = ['author', 'commits']
-        top_contributors = top_contributors.head(20)
+        top_contributors, all_contributors, activity_ts, contributors_per_repo = \
+            aggregate_contributor_activity(filtered_commits, filter_key)
         
         fig = px.bar(top_contributors, x='author', y='commits',
                    title=f"Top 20 Contributors by Commit Count - {selected_org}",
@@ -812,51 +1077,7 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
         
-        # Calculate cumulative percentage of commits
-        all_contributors = filtered_commits['author'].value_counts().reset_index()
-        all_contributors.columns = ['author', 'commits']
-        all_contributors = all_contributors.sort_values('commits', ascending=False)
-        
-        all_contributors['cum_commits'] = all_contributors['commits'].cumsum()
-        all_contributors['percent_total'] = 100 * all_contributors['cum_commits'] / all_contributors['commits'].sum()
-        all_contributors['contributor_rank'] = range(1, len(all_contributors) + 1)
-        all_contributors['contributor_percentile'] = 100 * all_contributors['contributor_rank'] / len(all_contributors)
-        
-        # Create Pareto chart
-        fig = px.line(all_contributors, x='contributor_percentile', y='percent_total',
-                     title="Contribution Distribution (Pareto Analysis)",
-                     labels={'contributor_percentile': 'Percentage of Contributors', 
-                             'percent_total': 'Percentage of Total Commits'})
-        
-        # Add reference line for equal distribution
-        x = np.linspace(0, 100, 100)
-        y = x  # Perfect equality line
-        fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name='Equal Distribution',
-                                line=dict(color='red', dash='dash')))
-        
-        # Add annotation for 80/20 rule if applicable
-        if len(all_contributors) > 5:
-            try:
-                # Find point closest to 20% of contributors
-                idx_20pct = (all_contributors['contributor_percentile'] - 20).abs().idxmin()
-                pct_at_20 = all_contributors.loc[idx_20pct, 'percent_total']
-                
-                fig.add_annotation(
-                    x=20, y=pct_at_20,
-                    text=f"Top 20% of contributors<br>make {pct_at_20:.0f}% of commits",
-                    showarrow=True,
-                    arrowhead=1
-                )
-            except:
-                pass
-        
-        fig.update_layout(
-            xaxis_title="Percentage of Contributors",
-            yaxis_title="Percentage of Total Commits",
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_pareto_figure(all_contributors, filter_key), use_container_width=True)
         
         # Contributor activity over time
         st.markdown('<div class="chart-header">Contributor Activity Over Time</div>', unsafe_allow_html=True)
@@ -869,25 +1090,9 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
         
-        # Get top 5 contributors for time series
-        top5_contributors = top_contributors.head(5)['author'].tolist()
-        top5_activity = filtered_commits[filtered_commits['author'].isin(top5_contributors)]
-        
-        if not top5_activity.empty:
-            # Group by date and author
-            activity_ts = top5_activity.groupby([pd.Grouper(key='date', freq='W'), 'author']).size().reset_index(name='commits')
-            
-            fig = px.line(activity_ts, x='date', y='commits', color='author',
-                        title=f"Weekly Commit Activity of Top 5 Contributors - {selected_org}",
-                        labels={"date": "Date", "commits": "Number of Commits", "author": "Contributor"})
-            
-            fig.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Number of Commits",
-                height=400
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        if not activity_ts.empty:
+            st.plotly_chart(build_weekly_contributors_figure(activity_ts, filter_key, selected_org),
+                            use_container_width=True)
         else:
             st.info("Not enough contributor data available for time series.")
         
@@ -901,11 +1106,6 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
         
-        # Count unique contributors per repository
-        contributors_per_repo = filtered_commits.groupby('repo_name')['author'].nunique().reset_index()
-        contributors_per_repo.columns = ['repo_name', 'contributor_count']
-        contributors_per_repo = contributors_per_repo.sort_values('contributor_count', ascending=False)
-        
         fig = px.bar(contributors_per_repo, x='repo_name', y='contributor_count',
                     title=f"Number of Unique Contributors per Repository - {selected_org}",
                     labels={"repo_name": "Repository", "contributor_count": "Number of Contributors"},
@@ -931,25 +1131,17 @@ with tab3:
             </div>
             """, unsafe_allow_html=True)
             
-            # Create a matrix of contributors by repo
-            contributors_by_repo = {}
-            for repo in selected_repos:
-                repo_commits = filtered_commits[filtered_commits['repo_name'] == repo]
-                contributors_by_repo[repo] = set(repo_commits['author'].unique())
+            # Create a contributor x repository membership matrix in one pass: each distinct
+            # (author, repo) pair sets the cell at the author's category code and the repo's
+            # position in selected_repos
+            contributor_repo_pairs = filtered_commits[['author', 'repo_name']].dropna().drop_duplicates()
+            membership = np.zeros((len(filtered_commits['author'].cat.categories), len(selected_repos)), dtype=np.int32)
+            repo_positions = pd.Index(selected_repos).get_indexer(contributor_repo_pairs['repo_name'])
+            membership[contributor_repo_pairs['author'].cat.codes, repo_positions] = 1
             
-            # Calculate overlap matrix
-            overlap_matrix = []
-            for repo1 in selected_repos:
-                row = []
-                for repo2 in selected_repos:
-                    if repo1 == repo2:
-                        # Diagonal shows total contributors for that repo
-                        row.append(len(contributors_by_repo[repo1]))
-                    else:
-                        # Off-diagonal shows overlap
-                        overlap = len(contributors_by_repo[repo1].intersection(contributors_by_repo[repo2]))
-                        row.append(overlap)
-                overlap_matrix.append(row)
+            # Calculate overlap matrix in one matrix product: off-diagonal cells count the
+            # contributors two repos share, the diagonal shows total contributors for that repo
+            overlap_matrix = membership.T @ membership
             
             # Create heatmap
             fig = go.Figure(data=go.Heatmap(
@@ -988,9 +1180,8 @@ with tab4:
     """, unsafe_allow_html=True)
     
     if not filtered_commits.empty:
-        # Extract day of week and hour of day if not already in the data
-        filtered_commits['day_of_week'] = filtered_commits['date'].dt.day_name()
-        filtered_commits['hour_of_day'] = filtered_commits['date'].dt.hour
+        day_counts, weekday_pct, hour_counts, business_pct, heatmap_counts = \
+            aggregate_time_patterns(filtered_commits, filter_key)
         
         col1, col2 = st.columns(2)
         
@@ -1006,21 +1197,11 @@ with tab4:
             </div>
             """, unsafe_allow_html=True)
             
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            day_counts = filtered_commits['day_of_week'].value_counts().reindex(day_order).reset_index()
-            day_counts.columns = ['day', 'commits']
-            
             fig = px.bar(day_counts, x='day', y='commits',
                        title=f"Commits by Day of Week - {selected_org}",
                        labels={"day": "Day", "commits": "Number of Commits"},
                        color='day')
             
-            # Calculate percentage of weekday vs weekend
-            weekday_mask = filtered_commits['day_of_week'].isin(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])
-            weekday_commits = weekday_mask.sum()
-            weekend_commits = (~weekday_mask).sum()
-            weekday_pct = 100 * weekday_commits / (weekday_commits + weekend_commits)
-            
             fig.update_layout(
                 xaxis_title="Day of Week",
                 yaxis_title="Number of Commits",
@@ -1052,16 +1233,6 @@ with tab4:
             </div>
             """, unsafe_allow_html=True)
             
-            hour_counts = filtered_commits['hour_of_day'].value_counts().sort_index().reset_index()
-            hour_counts.columns = ['hour', 'commits']
-            
-            # Calculate business hours vs non-business hours (simplified)
-            # Assume 9am-5pm is business hours in some standard time zone
-            business_mask = filtered_commits['hour_of_day'].between(9, 17)
-            business_commits = business_mask.sum()
-            nonbusiness_commits = (~business_mask).sum()
-            business_pct = 100 * business_commits / (business_commits + nonbusiness_commits)
-            
             fig = px.bar(hour_counts, x='hour', y='commits',
                        title=f"Commits by Hour of Day - {selected_org} (UTC)",
                        labels={"hour": "Hour (UTC)", "commits": "Number of Commits"},
@@ -1097,19 +1268,11 @@ with tab4:
         </div>
         """, unsafe_allow_html=True)
         
-        # Create a pivot table for the heatmap
-        pivot_data = filtered_commits.groupby(['day_of_week', 'hour_of_day']).size().reset_index(name='count')
-        pivot_table = pivot_data.pivot_table(values='count', index='day_of_week', columns='hour_of_day', fill_value=0)
-        
-        # Reorder days to start with Monday
-        if set(day_order).issubset(set(pivot_table.index)):
-            pivot_table = pivot_table.reindex(day_order)
-        
         # Create the heatmap
         fig = go.Figure(data=go.Heatmap(
-            z=pivot_table.values,
+            z=heatmap_counts,
             x=[f"{h}:00" for h in range(24)],
-            y=pivot_table.index,
+            y=DAY_NAMES,
             colorscale='Viridis',
             hovertemplate='Day: %{y}<br>Hour: %{x}<br>Commits: %{z}<extra></extra>'
         ))
@@ -1154,28 +1317,22 @@ with tab5:
             </div>
             """, unsafe_allow_html=True)
             
-            # Count commit types
-            commit_types = {
-                'Features': filtered_commits['feature'].sum(),
-                'Bug Fixes': filtered_commits['bug_fix'].sum(),
-                'Refactoring': filtered_commits['refactor'].sum(),
-                'Documentation': filtered_commits['docs'].sum(),
-                'Tests': filtered_commits['test'].sum(),
-                'Style Changes': filtered_commits['style'].sum(),
-                'Merges': filtered_commits['merge'].sum()
+            # Count commit types with one column-wise sum over the flag matrix
+            type_labels = {
+                'feature': 'Features',
+                'bug_fix': 'Bug Fixes',
+                'refactor': 'Refactoring',
+                'docs': 'Documentation',
+                'test': 'Tests',
+                'style': 'Style Changes',
+                'merge': 'Merges'
             }
+            type_flags = filtered_commits[list(type_labels)].to_numpy(dtype=bool)
+            commit_types = dict(zip(type_labels.values(), type_flags.sum(axis=0)))
             
             # Some commits might match multiple patterns or none
             # Count commits that don't match any pattern
-            no_match = len(filtered_commits[~(
-                filtered_commits['feature'] | 
-                filtered_commits['bug_fix'] | 
-                filtered_commits['refactor'] | 
-                filtered_commits['docs'] | 
-                filtered_commits['test'] | 
-                filtered_commits['style'] | 
-                filtered_commits['merge']
-            )])
+            no_match = int((~type_flags.any(axis=1)).sum())
             
             commit_types['Other/Unclassified'] = no_match
             
@@ -1209,26 +1366,12 @@ with tab5:
             </div>
             """, unsafe_allow_html=True)
             
-            # Group by month and count commit types
-            filtered_commits['month_year'] = filtered_commits['date'].dt.strftime('%Y-%m')
-            
-            # Calculate monthly counts for each type
-            monthly_types = []
-            for month in sorted(filtered_commits['month_year'].unique()):
-                month_commits = filtered_commits[filtered_commits['month_year'] == month]
-                for commit_type, column in [
-                    ('Features', 'feature'), 
-                    ('Bug Fixes', 'bug_fix'),
-                    ('Refactoring', 'refactor'),
-                    ('Documentation', 'docs')
-                ]:
-                    monthly_types.append({
-                        'month': month,
-                        'type': commit_type,
-                        'count': month_commits[column].sum()
-                    })
-            
-            types_df = pd.DataFrame(monthly_types)
+            # Calculate monthly counts for each type in one group-by, then reshape to
+            # one row per month and commit type
+            focus_types = {'feature': 'Features', 'bug_fix': 'Bug Fixes', 'refactor': 'Refactoring', 'docs': 'Documentation'}
+            monthly_types = filtered_commits.groupby('month_year')[list(focus_types)].sum()
+            types_df = (monthly_types.rename(columns=focus_types).rename_axis('month').reset_index()
+                        .melt(id_vars='month', var_name='type', value_name='count'))
             
             if not types_df.empty:
                 fig = px.line(types_df, x='month', y='count', color='type',
@@ -1257,27 +1400,12 @@ with tab5:
             </div>
             """, unsafe_allow_html=True)
             
-            # Calculate proportions for each repository
-            repo_focus = []
-            for repo in selected_repos:
-                repo_commits = filtered_commits[filtered_commits['repo_name'] == repo]
-                if len(repo_commits) > 0:
-                    total = len(repo_commits)
-                    for commit_type, column in [
-                        ('Features', 'feature'), 
-                        ('Bug Fixes', 'bug_fix'),
-                        ('Refactoring', 'refactor'),
-                        ('Documentation', 'docs')
-                    ]:
-                        count = repo_commits[column].sum()
-                        proportion = 100 * count / total
-                        repo_focus.append({
-                            'repository': repo,
-                            'type': commit_type,
-                            'proportion': proportion
-                        })
-            
-            repo_focus_df = pd.DataFrame(repo_focus)
+            # Calculate proportions for each repository in one group-by, then reshape to
+            # one row per repository and commit type
+            repo_groups = filtered_commits.groupby('repo_name', observed=True)
+            repo_focus = repo_groups[list(focus_types)].sum().mul(100).div(repo_groups.size(), axis=0)
+            repo_focus_df = (repo_focus.rename(columns=focus_types).rename_axis('repository').reset_index()
+                             .melt(id_vars='repository', var_name='type', value_name='proportion'))
             
             if not repo_focus_df.empty:
                 fig = px.bar(repo_focus_df, x='repository', y='proportion', color='type', barmode='group',
@@ -1304,7 +1432,7 @@ with tab5:
         </div>
         """, unsafe_allow_html=True)
         
-        recent_commits = filtered_commits.sort_values('date', ascending=False).head(10)[['date', 'repo_name', 'author', 'message']]
+        recent_commits = filtered_commits.nlargest(10, 'date')[['date', 'repo_name', 'author', 'message']]
         
         for idx, commit in recent_commits.iterrows():
             with st.expander(f"{commit['date'].strftime('%Y-%m-%d %H:%M')} - {commit['repo_name']}"):
@@ -1323,13 +1451,15 @@ provide a quick overview of the development activity to help understand focus ar
 """, unsafe_allow_html=True)
 
 if not filtered_commits.empty:
+    (most_active_repo, most_active_repo_commits), (most_active_contributor, most_active_contributor_commits), \
+        (most_active_day, most_active_day_commits), (most_active_hour, most_active_hour_commits) = \
+        aggregate_insights(filtered_commits, filter_key)
+    
     # Create two columns of insights
     insight_col1, insight_col2 = st.columns(2)
     
     with insight_col1:
         # Most active repository
-        most_active_repo = filtered_commits['repo_name'].value_counts().idxmax()
-        most_active_repo_commits = filtered_commits['repo_name'].value_counts().max()
         most_active_pct = 100 * most_active_repo_commits / len(filtered_commits)
         
         st.markdown(f"""
@@ -1341,8 +1471,6 @@ if not filtered_commits.empty:
         """, unsafe_allow_html=True)
         
         # Most prolific contributor
-        most_active_contributor = filtered_commits['author'].value_counts().idxmax()
-        most_active_contributor_commits = filtered_commits['author'].value_counts().max()
         contributor_pct = 100 * most_active_contributor_commits / len(filtered_commits)
         
         st.markdown(f"""
@@ -1355,9 +1483,6 @@ if not filtered_commits.empty:
     
     with insight_col2:
         # Most active day
-        day_activity = filtered_commits['day_of_week'].value_counts()
-        most_active_day = day_activity.idxmax()
-        most_active_day_commits = day_activity.max()
         day_pct = 100 * most_active_day_commits / len(filtered_commits)
         
         st.markdown(f"""
@@ -1369,9 +1494,6 @@ if not filtered_commits.empty:
         """, unsafe_allow_html=True)
         
         # Most active hour
-        hour_activity = filtered_commits['hour_of_day'].value_counts()
-        most_active_hour = hour_activity.idxmax()
-        most_active_hour_commits = hour_activity.max()
         hour_pct = 100 * most_active_hour_commits / len(filtered_commits)
         
         st.markdown(f"""
@@ -1,7 +1,14 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import csv
 import time
 import datetime
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from parquet_copies import DATE_COLUMNS, parquet_path, write_parquet_copy
 
 # ============ CONFIG ============
 
@@ -21,31 +28,218 @@ ORGS = [
 MAX_REPOS = 10
 MAX_COMMITS = 200
 
+# Repositories whose commits and contributors are fetched in parallel
+MAX_WORKERS = 8
+
+# Attempts per request on rate limiting or server errors
+MAX_RETRIES = 5
+
+# SQLite file caching REST responses with their ETag / Last-Modified validators, so
+# unchanged resources are answered with a 304 that doesn't count against the rate limit
+RESPONSE_CACHE = "etags.sqlite"
+
+# Buffer size of the CSV files, so rows reach the disk in a few large writes
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Seconds to wait for a response before giving up on a request
+REQUEST_TIMEOUT = 30
+
 # ============ FETCH LOGIC ============
 
+# Shared session, so all requests reuse pooled keep-alive connections instead of opening
+# a new TLS connection each time. The adapter retries dropped connections and server
+# errors with backoff; rate limits are handled in api_request.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=MAX_WORKERS,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=Retry(total=MAX_RETRIES, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504],
+                      allowed_methods=None, raise_on_status=False)
+))
+
+# Open the response cache, creating its table on first use. Each call opens its own
+# connection so the worker threads never share one.
+def open_response_cache():
+    db = sqlite3.connect(RESPONSE_CACHE, timeout=30)
+    db.execute("CREATE TABLE IF NOT EXISTS responses "
+               "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB)")
+    return db
+
+# Send a conditional GET using the validators cached for the url. Returns the response
+# and the cached body to use when the response is a 304.
+def cached_get(url):
+    db = open_response_cache()
+    cached = db.execute("SELECT etag, last_modified, body FROM responses WHERE url = ?", (url,)).fetchone()
+    
+    headers = {}
+    if cached and cached[0]:
+        headers["If-None-Match"] = cached[0]
+    elif cached and cached[1]:
+        headers["If-Modified-Since"] = cached[1]
+    
+    res = SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if res.status_code == 200 and ("ETag" in res.headers or "Last-Modified" in res.headers):
+        with db:
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                       (url, res.headers.get("ETag"), res.headers.get("Last-Modified"), res.content))
+    db.close()
+    return res, cached[2] if cached else None
+
+# Send a GET request (or a POST when a JSON body is given), waiting out rate limits.
+# Returns the status code and the parsed
+# JSON body (None unless the request succeeded).
+def api_request(url, json_body=None):
+    for attempt in range(MAX_RETRIES):
+        if json_body is None:
+            res, cached_body = cached_get(url)
+            if res.status_code == 304:
+                # Unchanged since the last run
+                return 200, json.loads(cached_body)
+        else:
+            res = SESSION.post(url, json=json_body, timeout=REQUEST_TIMEOUT)
+        
+        if res.status_code in (403, 429) and res.headers.get("X-RateLimit-Remaining") == "0":
+            # Primary rate limit exhausted: sleep until the window resets
+            wait = max(int(res.headers.get("X-RateLimit-Reset", 0)) - time.time(), 0) + 1
+        elif res.status_code in (403, 429) and "Retry-After" in res.headers:
+            # Secondary rate limit: the server says how long to back off
+            wait = int(res.headers["Retry-After"])
+        elif res.status_code == 429:
+            wait = 2 ** attempt
+        else:
+            break
+        
+        # Don't wait after the last attempt, since no request follows
+        if attempt == MAX_RETRIES - 1:
+            print(f"[!] {url} returned {res.status_code}, giving up after {MAX_RETRIES} attempts")
+            break
+        print(f"[!] {url} returned {res.status_code}, retrying in {wait:.0f}s")
+        time.sleep(wait)
+    return res.status_code, res.json() if res.status_code == 200 else None
+
 def get_repos(org):
     url = f"https://api.github.com/orgs/{org}/repos?per_page={MAX_REPOS}&sort=updated"
-    res = requests.get(url, headers=HEADERS)
-    if res.status_code != 200:
-        print(f"[!] Failed to get repos for {org}: {res.status_code}")
+    status, repos = api_request(url)
+    if status != 200:
+        print(f"[!] Failed to get repos for {org}: {status}")
         return []
-    return res.json()
+    return repos
 
 def get_commits(org, repo):
     url = f"https://api.github.com/repos/{org}/{repo}/commits?per_page={MAX_COMMITS}"
-    res = requests.get(url, headers=HEADERS)
-    if res.status_code != 200:
-        print(f"[!] Failed to get commits for {org}/{repo}: {res.status_code}")
+    status, commits = api_request(url)
+    if status != 200:
+        print(f"[!] Failed to get commits for {org}/{repo}: {status}")
         return []
-    return res.json()
+    return commits
 
 def get_contributors(org, repo, limit=10):
     url = f"https://api.github.com/repos/{org}/{repo}/contributors?per_page={limit}"
-    res = requests.get(url, headers=HEADERS)
-    if res.status_code != 200:
-        print(f"[!] Failed to get contributors for {org}/{repo}: {res.status_code}")
+    status, contributors = api_request(url)
+    if status != 200:
+        print(f"[!] Failed to get contributors for {org}/{repo}: {status}")
         return []
-    return res.json()
+    return contributors
+
+# GraphQL query returning an org's most recently updated repos together with the latest
+# commits of their default branch. GitHub caps `first` at 100 per connection.
+REPOS_QUERY = """
+query($org: String!, $repos: Int!, $commits: Int!) {
+  repositoryOwner(login: $org) {
+    repositories(first: $repos, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes {
+        name
+        databaseId
+        stargazerCount
+        forkCount
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        primaryLanguage { name }
+        createdAt
+        updatedAt
+        description
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(first: $commits) {
+                nodes { oid message committedDate additions deletions author { name email } }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Fetch an org's repos and their commits in a single GraphQL request (requires a token).
+# The result uses the REST field names, with each repo's commits under "commits".
+# Returns None if the request fails, so the caller can fall back to REST.
+def get_repos_with_commits(org):
+    variables = {"org": org, "repos": min(MAX_REPOS, 100), "commits": min(MAX_COMMITS, 100)}
+    status, data = api_request("https://api.github.com/graphql", {"query": REPOS_QUERY, "variables": variables})
+    data = data or {}
+    if not data.get("data") or not data["data"]["repositoryOwner"] or data.get("errors"):
+        print(f"[!] GraphQL query failed for {org}: {status} {data.get('errors', '')}")
+        return None
+    
+    repos = []
+    for node in data["data"]["repositoryOwner"]["repositories"]["nodes"]:
+        branch = node["defaultBranchRef"]
+        history = branch["target"]["history"]["nodes"] if branch else []
+        repos.append({
+            "name": node["name"],
+            "id": node["databaseId"],
+            "stargazers_count": node["stargazerCount"],
+            # REST counts open pull requests as issues and reports stars as watchers
+            "open_issues_count": node["issues"]["totalCount"] + node["pullRequests"]["totalCount"],
+            "watchers_count": node["stargazerCount"],
+            "forks_count": node["forkCount"],
+            "language": node["primaryLanguage"]["name"] if node["primaryLanguage"] else None,
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+            "description": node["description"],
+            "commits": [{
+                "sha": commit["oid"],
+                "stats": {"additions": commit["additions"], "deletions": commit["deletions"]},
+                "commit": {
+                    # GraphQL returns a null author where REST always has the object
+                    "author": commit["author"] or {"name": None, "email": None},
+                    "committer": {"date": commit["committedDate"]},
+                    "message": commit["message"]
+                }
+            } for commit in history]
+        })
+    return repos
+
+# Fetch the repos of an organization, with their commits when GraphQL is available
+def get_org_repos(org):
+    print(f"Fetching repos for organization: {org}")
+    repos = get_repos_with_commits(org) if TOKEN else None
+    if repos is not None:
+        return repos, True
+    return get_repos(org), False
+
+# Fetch the commits and top contributors of one repository
+def get_repo_details(org, repo):
+    print(f"Fetching commits and contributors for repo: {org}/{repo}")
+    return get_commits(org, repo), get_contributors(org, repo)
+
+# Weekday names indexed by date.weekday()
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Get the weekday name of a YYYY-MM-DD date. Commits cluster on few days, so names are cached.
+@lru_cache(maxsize=None)
+def day_name(day):
+    return WEEKDAYS[datetime.date.fromisoformat(day).weekday()]
+
+# Write a columnar Parquet copy next to each CSV. The copies are newer than the CSVs,
+# so the dashboard reads them directly instead of parsing the text on its first load.
+def write_parquet_copies():
+    for csv_path in DATE_COLUMNS:
+        write_parquet_copy(csv_path)
 
 # ============ MAIN ============
 
@@ -53,9 +247,10 @@ def fetch_data():
     print("Starting GitHub data extraction...")
     start_time = datetime.datetime.now()
     
-    with open("repositories.csv", "w", newline='', encoding='utf-8') as repo_file, \
-         open("commits.csv", "w", newline='', encoding='utf-8') as commit_file, \
-         open("contributors.csv", "w", newline='', encoding='utf-8') as contributor_file:
+    with open("repositories.csv", "w", newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as repo_file, \
+         open("commits.csv", "w", newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as commit_file, \
+         open("contributors.csv", "w", newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as contributor_file, \
+         ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
 
         repo_writer = csv.writer(repo_file)
         commit_writer = csv.writer(commit_file)
@@ -83,11 +278,20 @@ def fetch_data():
         commits_fetched = 0
         contributors_fetched = 0
 
-        for org in ORGS:
-            print(f"Fetching repos for organization: {org}")
-            repos = get_repos(org)
+        # The repo lists of all organizations are fetched concurrently up front
+        org_repos = executor.map(get_org_repos, ORGS)
+        
+        for org, (repos, has_commits) in zip(ORGS, org_repos):
+            # Fetch the details of all repos of the org concurrently; map returns them in
+            # repo order, so the files are still written from this thread in a fixed order
+            if has_commits:
+                # GraphQL already returned the commits; only contributors need REST calls
+                contributor_lists = executor.map(get_contributors, [org] * len(repos), [repo["name"] for repo in repos])
+                repo_details = zip([repo["commits"] for repo in repos], contributor_lists)
+            else:
+                repo_details = executor.map(get_repo_details, [org] * len(repos), [repo["name"] for repo in repos])
 
-            for repo in repos:
+            for repo, (commits, contributors) in zip(repos, repo_details):
                 repo_name = repo["name"]
                 
                 # More detailed repository data
@@ -106,8 +310,8 @@ def fetch_data():
                 ])
                 repos_fetched += 1
 
-                print(f"Fetching commits for repo: {org}/{repo_name}")
-                commits = get_commits(org, repo_name)
+                # Collect the repo's commit rows and write them in one batch
+                commit_rows = []
                 for commit in commits:
                     # Get commit details
                     commit_sha = commit["sha"]
@@ -117,17 +321,20 @@ def fetch_data():
                     message = commit_data["message"].replace("\n", " ")
                     date = commit_data["committer"]["date"]
                     
-                    # Calculate day of week and hour of day from commit date
-                    commit_date = datetime.datetime.strptime(date, "%Y-%m-%dT%H:%M:%SZ")
-                    day_of_week = commit_date.strftime('%A')
-                    hour_of_day = commit_date.hour
+                    # Calculate day of week and hour of day from commit date. GitHub dates
+                    # are always YYYY-MM-DDTHH:MM:SSZ, so the hour is sliced out and the
+                    # weekday is looked up once per calendar day
+                    day_of_week = day_name(date[:10])
+                    hour_of_day = int(date[11:13])
                     
-                    # For additions/deletions, we'd need another API call per commit
-                    # But that would hit rate limits quickly, so use placeholders
-                    additions = 0
-                    deletions = 0
+                    # GraphQL returns additions/deletions with the commit list. The REST
+                    # list omits them and an extra call per commit would hit rate limits
+                    # quickly, so REST commits use placeholders
+                    stats = commit.get("stats", {})
+                    additions = stats.get("additions", 0)
+                    deletions = stats.get("deletions", 0)
 
-                    commit_writer.writerow([
+                    commit_rows.append([
                         org,
                         repo_name,
                         commit_sha,
@@ -140,36 +347,34 @@ def fetch_data():
                         additions,
                         deletions
                     ])
-                    commits_fetched += 1
+                commit_writer.writerows(commit_rows)
+                commits_fetched += len(commit_rows)
 
-                # Get top contributors
-                print(f"Fetching contributors for repo: {org}/{repo_name}")
-                contributors = get_contributors(org, repo_name)
-                for contributor in contributors:
-                    contributor_writer.writerow([
-                        org,
-                        repo_name,
-                        contributor["login"],
-                        contributor["id"],
-                        contributor["contributions"]
-                    ])
-                    contributors_fetched += 1
+                # Write top contributors
+                contributor_writer.writerows([
+                    org,
+                    repo_name,
+                    contributor["login"],
+                    contributor["id"],
+                    contributor["contributions"]
+                ] for contributor in contributors)
+                contributors_fetched += len(contributors)
 
-                time.sleep(1)  # Rate limit safety
+    # Write the Parquet copies the dashboard loads, now that the CSVs are complete
+    write_parquet_copies()
 
-        end_time = datetime.datetime.now()
-        duration = end_time - start_time
-        
-        print("\n=== GitHub Data Extraction Summary ===")
-        print(f"Total organizations: {len(ORGS)}")
-        print(f"Total repositories: {repos_fetched}")
-        print(f"Total commits: {commits_fetched}")
-        print(f"Total contributors: {contributors_fetched}")
-        print(f"Duration: {duration}")
-        print("Files saved:")
-        print("- repositories.csv")
-        print("- commits.csv")
-        print("- contributors.csv")
+    end_time = datetime.datetime.now()
+    duration = end_time - start_time
+    
+    print("\n=== GitHub Data Extraction Summary ===")
+    print(f"Total organizations: {len(ORGS)}")
+    print(f"Total repositories: {repos_fetched}")
+    print(f"Total commits: {commits_fetched}")
+    print(f"Total contributors: {contributors_fetched}")
+    print(f"Duration: {duration}")
+    print("Files saved:")
+    for csv_path in DATE_COLUMNS:
+        print(f"- {csv_path} ({parquet_path(csv_path)})")
 
 # Run the script
 if __name__ == "__main__":
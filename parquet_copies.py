@@ -0,0 +1,31 @@
+import os
+import pandas as pd
+
+# Parquet copies of the data CSVs, shared by fetch_github_data.py (which writes them after
+# a fetch) and dashboard.py (which rebuilds them when a CSV is newer than its copy)
+
+# Data CSVs and the columns parsed as dates in their Parquet copies. The same names
+# are used under github_data/.
+DATE_COLUMNS = {
+    "repositories.csv": ["created_at", "updated_at"],
+    "commits.csv": ["date"],
+    "contributors.csv": None
+}
+
+# Repeated text columns stored as categoricals in the Parquet copies. Parquet keeps them
+# dictionary-encoded and they load back as categoricals, so each distinct string is only
+# materialized once per load.
+CATEGORY_COLUMNS = ['org', 'repo_name', 'language', 'author', 'author_email', 'message', 'day_of_week',
+                    'contributor_login']
+
+# Function to get the path of the Parquet copy of a CSV
+def parquet_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+# Function to write the Parquet copy of a CSV, returning its path
+def write_parquet_copy(csv_path):
+    csv_df = pd.read_csv(csv_path, engine='pyarrow', parse_dates=DATE_COLUMNS[os.path.basename(csv_path)])
+    category_cols = [col for col in CATEGORY_COLUMNS if col in csv_df.columns]
+    csv_df[category_cols] = csv_df[category_cols].astype('category')
+    csv_df.to_parquet(parquet_path(csv_path), engine='pyarrow', compression='zstd', index=False)
+    return parquet_path(csv_path)
@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_FILES = ["repositories.csv", "commits.csv", "contributors.csv"]
+
+
+# Copy the dashboard and its data into a temporary directory and run it from there
+def run_dashboard(tmp_path, monkeypatch):
+    for name in ["dashboard.py", "parquet_copies.py"]:
+        shutil.copy(os.path.join(REPO_DIR, name), tmp_path)
+    for name in DATA_FILES:
+        shutil.copy(os.path.join(REPO_DIR, name), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_dashboard_renders(tmp_path, monkeypatch):
+    run_dashboard(tmp_path, monkeypatch)
+    at = AppTest.from_file(str(tmp_path / "dashboard.py"), default_timeout=60).run()
+    assert not at.exception
+
+
+@pytest.mark.parametrize("table", ["commits.csv", "contributors.csv"])
+def test_dashboard_renders_org_missing_from_table(tmp_path, monkeypatch, table):
+    run_dashboard(tmp_path, monkeypatch)
+    
+    # Drop the rows of the organization selected by default, as left by failed requests
+    default_org = sorted(pd.read_csv(tmp_path / "repositories.csv")["org"].unique())[0]
+    df = pd.read_csv(tmp_path / table)
+    df[df["org"] != default_org].to_csv(tmp_path / table, index=False)
+    
+    at = AppTest.from_file(str(tmp_path / "dashboard.py"), default_timeout=60).run()
+    assert not at.exception
+    assert at.sidebar.selectbox[0].value == default_org
+
+
+def test_dashboard_renders_without_authors(tmp_path, monkeypatch):
+    run_dashboard(tmp_path, monkeypatch)
+    
+    # Commits whose author is missing everywhere leave the author counts empty
+    commits = pd.read_csv(tmp_path / "commits.csv")
+    commits["author"] = None
+    commits.to_csv(tmp_path / "commits.csv", index=False)
+    
+    at = AppTest.from_file(str(tmp_path / "dashboard.py"), default_timeout=60).run()
+    assert not at.exception
+
+
+def test_dashboard_picks_up_rewritten_data(tmp_path, monkeypatch):
+    run_dashboard(tmp_path, monkeypatch)
+    at = AppTest.from_file(str(tmp_path / "dashboard.py"), default_timeout=60).run()
+    
+    # Keep every other commit, as a new fetch would rewrite the file, and rerun the same selection
+    commits = pd.read_csv(tmp_path / "commits.csv").iloc[::2]
+    commits.to_csv(tmp_path / "commits.csv", index=False)
+    mtime = os.path.getmtime(tmp_path / "commits.csv") + 10
+    os.utime(tmp_path / "commits.csv", (mtime, mtime))
+    at.run()
+    
+    assert not at.exception
+    insights = [m.value for m in at.markdown if "Most Active Repository" in m.value]
+    org_commits = commits[commits["org"] == at.sidebar.selectbox[0].value]
+    top_repo_commits = org_commits["repo_name"].value_counts().iat[0]
+    assert f"{top_repo_commits:,} commits" in insights[0]
+
+
+def test_commit_activity_charts_are_capped(tmp_path, monkeypatch):
+    run_dashboard(tmp_path, monkeypatch)
+    
+    # One commit per day over 12 years in each repository of the sample commits
+    commits = pd.read_csv(tmp_path / "commits.csv")
+    repo_commits = commits.drop_duplicates(["org", "repo_name"]).drop(columns="date")
+    dates = pd.DataFrame({"date": pd.date_range("2012-01-01", periods=12 * 365, freq="D")
+                                    .strftime("%Y-%m-%dT12:00:00Z")})
+    repo_commits.merge(dates, how="cross").to_csv(tmp_path / "commits.csv", index=False)
+    
+    at = AppTest.from_file(str(tmp_path / "dashboard.py"), default_timeout=60).run()
+    assert not at.exception
+    for chart in at.get("plotly_chart"):
+        for trace in json.loads(chart.proto.figure.spec)["data"]:
+            assert len(trace.get("x") or []) <= 2000